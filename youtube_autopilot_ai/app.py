@@ -6,18 +6,29 @@ the autopilot script on demand.  The configuration is stored in a
 JSON file (`config.json`) in the project root.  The autopilot
 functionality itself is implemented in `autopilot.py`.
 
-To run the development server:
+To run the development server (set ``FLASK_DEV=1`` to enable the
+debugger and auto-reloader):
 
     python app.py
 
+For production use, serve ``wsgi:application`` with a WSGI server such
+as Gunicorn instead.
 """
 
 from __future__ import annotations
 
-import json
+import copy
+import hmac
 import os
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, List
+from uuid import uuid4
 
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from flask import (
     Flask,
     render_template,
@@ -41,29 +52,178 @@ app.secret_key = "replace_this_with_a_random_secret"
 # application structure, update the path accordingly.
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
 
+# In-process copy of the configuration.  ``load_config`` only re-reads
+# the file when its modification time changes, so most requests avoid
+# the open/parse round trip entirely.
+_CFG_CACHE: Dict[str, Any] = {"mtime": 0.0, "data": None}
+
 
 def load_config() -> Dict[str, Any]:
-    """Load the JSON configuration from disk.
+    """Load the JSON configuration, re-reading the file only if it changed.
+
+    A deep copy of the cached configuration is returned so callers may
+    mutate it freely without affecting the cache.
 
     Returns
     -------
     dict
         The configuration as a Python dictionary.
     """
-    with open(CONFIG_FILE, "r", encoding="utf-8") as fh:
-        return json.load(fh)
+    mtime = os.stat(CONFIG_FILE).st_mtime
+    if _CFG_CACHE["data"] is None or mtime != _CFG_CACHE["mtime"]:
+        with open(CONFIG_FILE, "rb") as fh:
+            _CFG_CACHE["data"] = orjson.loads(fh.read())
+        _CFG_CACHE["mtime"] = mtime
+    return copy.deepcopy(_CFG_CACHE["data"])
 
 
 def save_config(cfg: Dict[str, Any]) -> None:
     """Persist the JSON configuration to disk.
 
+    The configuration is written to a temporary file in the same
+    directory and atomically renamed over `config.json`, so a crash
+    mid-write never leaves a truncated file behind.
+
     Parameters
     ----------
     cfg : dict
         The configuration to save.
     """
-    with open(CONFIG_FILE, "w", encoding="utf-8") as fh:
-        json.dump(cfg, fh, indent=2)
+    try:
+        mode = os.stat(CONFIG_FILE).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_FILE), prefix=".cfg.", suffix=".json")
+    try:
+        try:
+            fh = os.fdopen(fd, "wb")
+        except BaseException:
+            os.close(fd)
+            raise
+        with fh:
+            fh.write(orjson.dumps(cfg, option=orjson.OPT_INDENT_2))
+        # mkstemp creates the file as 0600; keep the original permissions.
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, CONFIG_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _CFG_CACHE["data"] = copy.deepcopy(cfg)
+    _CFG_CACHE["mtime"] = os.stat(CONFIG_FILE).st_mtime
+
+
+# Autopilot runs are executed in the background so a request never
+# blocks for the full audio/image/video pipeline.  A single worker
+# serialises runs, which all write into the project directory.
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+_JOBS: Dict[str, Future] = {}
+# Completion time (``time.monotonic()``) of each finished job in `_JOBS`.
+_JOB_FINISHED: Dict[str, float] = {}
+# Finished jobs that nobody polled are forgotten after this many seconds.
+JOB_TTL = 60 * 60
+
+
+def _submit_job(topics: List[str]) -> str:
+    """Submit an autopilot run in the background and return its job id."""
+    job_id = uuid4().hex
+    future = _EXECUTOR.submit(autopilot.run_autopilot, topics)
+    _JOBS[job_id] = future
+    future.add_done_callback(lambda _: _JOB_FINISHED.__setitem__(job_id, time.monotonic()))
+    return job_id
+
+
+def _job_pending() -> bool:
+    """Return ``True`` if an autopilot job is queued or running."""
+    return any(not future.done() for future in list(_JOBS.values()))
+
+
+def _prune_jobs() -> None:
+    """Forget finished jobs whose outcome was not collected within `JOB_TTL`."""
+    cutoff = time.monotonic() - JOB_TTL
+    for job_id, finished in list(_JOB_FINISHED.items()):
+        if finished < cutoff:
+            _JOBS.pop(job_id, None)
+            _JOB_FINISHED.pop(job_id, None)
+
+
+def _report_job(job_id: str) -> bool:
+    """Flash the outcome of a finished autopilot job and forget it.
+
+    Returns
+    -------
+    bool
+        ``True`` if the job has finished (or is unknown), ``False`` if it
+        is still running.
+    """
+    future = _JOBS.get(job_id)
+    if future is None:
+        flash("Autopilot job not found; its result may have expired.", "danger")
+        return True
+    if not future.done():
+        flash("Autopilot is still running. Reload the page to check again.", "info")
+        return False
+    del _JOBS[job_id]
+    _JOB_FINISHED.pop(job_id, None)
+    exc = future.exception()
+    if exc is not None:
+        flash(f"Autopilot failed: {exc}", "danger")
+    else:
+        flash(f"Autopilot completed successfully. Video saved to {future.result()}.", "success")
+    return True
+
+
+# Shared argon2 hasher for the admin password.
+_HASHER = PasswordHasher()
+
+
+def check_credentials(cfg: Dict[str, Any], username: str, password: str) -> bool:
+    """Validate the admin credentials against the configuration.
+
+    The password is verified against ``admin_password_hash``.  A legacy
+    plain-text ``admin_password`` is still accepted; after a successful
+    login it is replaced by its hash and the configuration is saved.
+    Login is always refused if no username or password is configured.
+
+    Parameters
+    ----------
+    cfg : dict
+        The current configuration.
+    username : str
+        The submitted username.
+    password : str
+        The submitted password.
+
+    Returns
+    -------
+    bool
+        ``True`` if the credentials are valid.
+    """
+    admin_username = cfg.get("admin_username")
+    password_hash = cfg.get("admin_password_hash")
+    plain_password = cfg.get("admin_password")
+    if not admin_username or not (password_hash or plain_password):
+        return False
+    username_ok = hmac.compare_digest(username.encode("utf-8"), admin_username.encode("utf-8"))
+    if password_hash:
+        try:
+            password_ok = _HASHER.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            password_ok = False
+    else:
+        password_ok = hmac.compare_digest(password.encode("utf-8"), plain_password.encode("utf-8"))
+    if not (username_ok and password_ok):
+        return False
+    if not password_hash or _HASHER.check_needs_rehash(password_hash):
+        cfg["admin_password_hash"] = _HASHER.hash(password)
+        cfg.pop("admin_password", None)
+        save_config(cfg)
+    return True
+
+
+def _clean(form: Any, key: str) -> str:
+    """Return the stripped value of a form field, or ``""`` if missing."""
+    value = form.get(key)
+    return value.strip() if value else ""
 
 
 def is_logged_in() -> bool:
@@ -91,9 +251,10 @@ def login():
     cfg = load_config()
     error = None
     if request.method == "POST":
-        username = request.form.get("username", "").strip()
-        password = request.form.get("password", "").strip()
-        if username == cfg.get("admin_username") and password == cfg.get("admin_password"):
+        form = request.form
+        username = _clean(form, "username")
+        password = _clean(form, "password")
+        if check_credentials(cfg, username, password):
             session["logged_in"] = True
             flash("Logged in successfully.", "success")
             return redirect(url_for("dashboard"))
@@ -117,49 +278,68 @@ def dashboard():
 
     The dashboard allows the administrator to add or remove topics and
     trigger the autopilot to produce a new video.  All changes to the
-    configuration are persisted back to `config.json`.
+    configuration are persisted back to `config.json`.  Autopilot runs
+    are submitted as background jobs; the outcome of the most recent
+    job is reported on the next page load once it has finished.
     """
     if not is_logged_in():
         return redirect(url_for("login"))
     cfg = load_config()
-    topics: List[str] = cfg.get("topics", [])
-    # Handle adding a new topic
+    # Mutations below operate on this list in place, so the config dict
+    # always reflects the rendered topics.
+    topics: List[str] = cfg.setdefault("topics", [])
+    dirty = False
     if request.method == "POST":
         # Determine which action was triggered
-        if request.form.get("action") == "add_topic":
-            new_topic = request.form.get("new_topic", "").strip()
+        action = request.form.get("action")
+        if action == "add_topic":
+            new_topic = _clean(request.form, "new_topic")
             if new_topic:
                 topics.append(new_topic)
-                cfg["topics"] = topics
-                save_config(cfg)
+                dirty = True
                 flash(f"Added topic '{new_topic}'.", "success")
             else:
                 flash("Topic cannot be empty.", "danger")
-        elif request.form.get("action") == "remove_topic":
-            remove_idx_str = request.form.get("remove_index")
-            if remove_idx_str and remove_idx_str.isdigit():
-                idx = int(remove_idx_str)
+        elif action == "remove_topic":
+            try:
+                idx = int(request.form.get("remove_index") or "")
+            except ValueError:
+                flash("No topic selected for removal.", "danger")
+            else:
                 if 0 <= idx < len(topics):
                     removed = topics.pop(idx)
-                    cfg["topics"] = topics
-                    save_config(cfg)
+                    dirty = True
                     flash(f"Removed topic '{removed}'.", "info")
                 else:
                     flash("Invalid topic index.", "danger")
+        elif action == "run_autopilot":
+            if _job_pending():
+                flash("An autopilot job is already running. Please wait for it to finish.", "danger")
             else:
-                flash("No topic selected for removal.", "danger")
-        elif request.form.get("action") == "run_autopilot":
-            try:
-                video_path = autopilot.run_autopilot(topics)
-                flash(f"Autopilot completed successfully. Video saved to {video_path}.", "success")
-            except Exception as exc:
-                flash(f"Autopilot failed: {exc}", "danger")
-    # Reload configuration to reflect any changes
-    cfg = load_config()
-    return render_template("dashboard.html", topics=cfg.get("topics", []))
+                session["last_job"] = _submit_job(list(topics))
+                flash("Autopilot job submitted. Reload the page to check its status.", "info")
+    else:
+        _prune_jobs()
+        if "last_job" in session and _report_job(session["last_job"]):
+            session.pop("last_job")
+    # Persist at most once per request
+    if dirty:
+        save_config(cfg)
+    return render_template("dashboard.html", topics=topics, job_id=session.get("last_job"))
+
+
+@app.route("/job/<job_id>")
+def job_status(job_id: str):
+    """Report the status of a background autopilot job."""
+    if not is_logged_in():
+        return redirect(url_for("login"))
+    if _report_job(job_id) and session.get("last_job") == job_id:
+        session.pop("last_job")
+    return redirect(url_for("dashboard"))
 
 
 if __name__ == "__main__":
     # Run the development server.  In production, use a WSGI server like
-    # Gunicorn or uWSGI.
-    app.run(debug=True)
+    # Gunicorn or uWSGI with `wsgi.py`.  Debug mode is opt-in because the
+    # debugger allows arbitrary code execution.
+    app.run(debug=os.environ.get("FLASK_DEV") == "1")
@@ -12,15 +12,104 @@ succeed.
 
 from __future__ import annotations
 
-import json
+import hashlib
+import io
 import os
+import shutil
 import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import List, Dict, Optional
+from fractions import Fraction
+from typing import Any, Iterable, List, Dict, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from gtts import gTTS
-from bs4 import BeautifulSoup
+from PIL import Image
+
+try:  # PyAV is optional; without it videos are built by the ffmpeg CLI.
+    import av
+except ImportError:  # pragma: no cover - depends on the environment
+    av = None
+
+try:  # piper is optional; without it narration falls back to gTTS.
+    from piper.voice import PiperVoice
+except ImportError:  # pragma: no cover - depends on the environment
+    PiperVoice = None
+
+
+# Connect/read timeouts (seconds) applied to every HTTP request.
+_CONNECT_TIMEOUT, _READ_TIMEOUT = 3.05, 10
+
+# Overall time budget (seconds) for a single `run_autopilot` call.
+AUTOPILOT_TIMEOUT = 120
+
+# A single shared session so repeated runs reuse keep-alive connections
+# to Reddit and Unsplash instead of paying a TCP+TLS handshake per call.
+# Transient failures are retried with exponential backoff.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        ),
+    ),
+)
+_SESSION.headers.update({"User-Agent": "Mozilla/5.0 (compatible; AI-Autopilot/1.0)"})
+
+# Where `run_autopilot` fetches live topics from: "reddit" (the default)
+# or "pushshift".
+TOPIC_SOURCE = os.environ.get("AUTOPILOT_TOPIC_SOURCE", "reddit")
+
+# Path to the piper voice model used for local speech synthesis.  The
+# model is loaded lazily on first use and shared across runs.
+PIPER_MODEL = os.environ.get(
+    "PIPER_MODEL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "en_US-lessac-medium.onnx"),
+)
+_VOICE = None
+_VOICE_LOCK = threading.Lock()
+
+# Downloaded background images are cached here, keyed by query and size,
+# and reused for up to ``IMAGE_CACHE_TTL`` seconds.
+IMAGE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+IMAGE_CACHE_TTL = 6 * 60 * 60
+
+# Pre-encoded black frame written when the background image download
+# fails at the default video size.
+_FALLBACK_SIZE = (1280, 720)
+_FALLBACK_JPEG = io.BytesIO()
+Image.new("RGB", _FALLBACK_SIZE, color=(0, 0, 0)).save(_FALLBACK_JPEG, "JPEG", quality=85)
+_FALLBACK_BYTES = _FALLBACK_JPEG.getvalue()
+
+
+def _parse_posts(posts: Iterable[Optional[Dict[str, Any]]]) -> List[Dict[str, str]]:
+    """Extract the title and URL of each post, skipping incomplete ones."""
+    topics: List[Dict[str, str]] = []
+    append = topics.append  # avoid re-resolving the method per post
+    for post_data in posts:
+        if not post_data:
+            continue
+        title = post_data.get("title")
+        permalink = post_data.get("permalink")
+        if not title or not permalink:
+            continue
+        append({
+            "title": title,
+            "url": "https://reddit.com" + permalink,
+        })
+    return topics
 
 
 def get_trending_topics(num_topics: int = 5) -> List[Dict[str, str]]:
@@ -42,29 +131,56 @@ def get_trending_topics(num_topics: int = 5) -> List[Dict[str, str]]:
         A list of dictionaries containing the title and URL of each
         top post.
     """
-    url = f"https://www.reddit.com/r/artificial/top/.json?limit={num_topics}&t=day"
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; AI-Autopilot/1.0)"}
+    url = f"https://www.reddit.com/r/artificial/top/.json?limit={num_topics}&t=day&raw_json=1&sr_detail=false"
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT))
         response.raise_for_status()
-        data = response.json()
-        topics: List[Dict[str, str]] = []
-        for post in data.get("data", {}).get("children", []):
-            post_data = post.get("data", {})
-            title = post_data.get("title")
-            permalink = post_data.get("permalink")
-            if not title or not permalink:
-                continue
-            topics.append({
-                "title": title,
-                "url": f"https://reddit.com{permalink}",
-            })
-        return topics
+        data = orjson.loads(response.content)
+        return _parse_posts(post.get("data") for post in data.get("data", {}).get("children", ()))
     except Exception:
         # Fallback: return an empty list if Reddit is unreachable
         return []
 
 
+def get_trending_topics_pushshift(num_topics: int = 5) -> List[Dict[str, str]]:
+    """Fetch the highest scoring r/artificial posts from Pushshift.
+
+    An alternative to `get_trending_topics` for larger or historical
+    queries, used by `run_autopilot` when ``TOPIC_SOURCE`` is
+    ``"pushshift"``.  Pushshift only returns the requested fields, which
+    keeps responses much smaller than Reddit's own listing JSON.
+
+    Parameters
+    ----------
+    num_topics : int, optional
+        The number of posts to fetch (default is 5).
+
+    Returns
+    -------
+    list of dict
+        A list of dictionaries containing the title and URL of each
+        post, in the same format as `get_trending_topics`.
+    """
+    url = (
+        "https://api.pushshift.io/reddit/search/submission/"
+        f"?subreddit=artificial&size={num_topics}&sort=desc&sort_type=score&fields=title,permalink"
+    )
+    try:
+        response = _SESSION.get(url, timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT))
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        return _parse_posts(data.get("data", ()))
+    except Exception:
+        # Fallback: return an empty list if Pushshift is unreachable
+        return []
+
+
+# Fixed narration lines surrounding the stories in `generate_script`.
+_SCRIPT_HEADER = "Hello and welcome to today's AI news update."
+_SCRIPT_FOOTER = "Thank you for watching. Don't forget to like and subscribe for more AI news!"
+_SCRIPT_EMPTY = "Unfortunately, I could not retrieve the latest stories. Please check back later."
+
+
 def generate_script(topics: List[Dict[str, str]]) -> str:
     """Compose the narration script from a list of topics.
 
@@ -82,23 +198,33 @@ def generate_script(topics: List[Dict[str, str]]) -> str:
     str
         The full narration script.
     """
-    lines: List[str] = ["Hello and welcome to today's AI news update."]
-    if not topics:
-        lines.append("Unfortunately, I could not retrieve the latest stories. Please check back later.")
+    if topics:
+        body = ("Story %d: %s." % (idx, topic.get("title", "")) for idx, topic in enumerate(topics, start=1))
     else:
-        for idx, topic in enumerate(topics, start=1):
-            title = topic.get("title", "")
-            lines.append(f"Story {idx}: {title}.")
-    lines.append("Thank you for watching. Don't forget to like and subscribe for more AI news!")
-    return " \n".join(lines)
+        body = (_SCRIPT_EMPTY,)
+    return " \n".join((_SCRIPT_HEADER, *body, _SCRIPT_FOOTER))
 
 
-def generate_audio(script_text: str, audio_filename: str) -> None:
-    """Create an audio file from text using gTTS.
+def _load_voice():
+    """Return the cached piper voice, or ``None`` if it is unavailable."""
+    global _VOICE
+    if PiperVoice is None or not os.path.exists(PIPER_MODEL):
+        return None
+    with _VOICE_LOCK:
+        if _VOICE is None:
+            _VOICE = PiperVoice.load(PIPER_MODEL)
+    return _VOICE
 
-    The file will be saved in MP3 format.  gTTS communicates with
-    Google’s text‑to‑speech service; an internet connection is
-    required.
+
+def generate_audio(script_text: str, audio_filename: str) -> str:
+    """Create an audio file from text.
+
+    If piper (1.3 or later) and its voice model (see ``PIPER_MODEL``) are
+    available, speech is synthesised locally and saved as WAV, replacing
+    the extension of `audio_filename`.  Otherwise, or if local synthesis
+    fails, the file is saved in MP3
+    format using gTTS, which communicates with Google’s text‑to‑speech
+    service; an internet connection is then required.
 
     Parameters
     ----------
@@ -106,17 +232,38 @@ def generate_audio(script_text: str, audio_filename: str) -> None:
         The narration text to convert to speech.
     audio_filename : str
         The path where the audio file should be saved.
+
+    Returns
+    -------
+    str
+        The path of the audio file actually written.
     """
+    wav_filename = os.path.splitext(audio_filename)[0] + ".wav"
+    try:
+        voice = _load_voice()
+        if voice is not None:
+            with wave.open(wav_filename, "wb") as wf:
+                voice.synthesize_wav(script_text, wf)
+            return wav_filename
+    except Exception:
+        # Fall back to gTTS if the model cannot be loaded or synthesis fails
+        try:
+            os.remove(wav_filename)
+        except OSError:
+            pass
     tts = gTTS(text=script_text)
     tts.save(audio_filename)
+    return audio_filename
 
 
 def download_image(query: str, width: int, height: int, image_filename: str) -> None:
     """Download a random image from Unsplash matching a query.
 
     Uses the Unsplash source service which does not require an API key.
-    An internet connection is required.  If the download fails, a
-    fallback solid colour image is created instead.
+    An internet connection is required.  Downloads are cached in
+    ``IMAGE_CACHE_DIR`` and reused for ``IMAGE_CACHE_TTL`` seconds.  If
+    the download fails, an expired cached image is used if available,
+    otherwise a fallback solid colour image is created instead.
 
     Parameters
     ----------
@@ -129,58 +276,235 @@ def download_image(query: str, width: int, height: int, image_filename: str) ->
     image_filename : str
         The path where the image should be saved.
     """
+    key = hashlib.blake2b(f"{query}|{width}x{height}".encode(), digest_size=8).hexdigest()
+    cache_path = os.path.join(IMAGE_CACHE_DIR, f"img_{key}.jpg")
+    try:
+        if time.time() - os.path.getmtime(cache_path) < IMAGE_CACHE_TTL:
+            shutil.copyfile(cache_path, image_filename)
+            return
+    except OSError:
+        pass  # not cached yet
     url = f"https://source.unsplash.com/random/{width}x{height}/?{query}"
+    # Write to a temporary name first so a concurrent run never copies a
+    # partially written cache entry.
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        resp = requests.get(url, timeout=15)
+        resp = _SESSION.get(url, timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT))
         resp.raise_for_status()
-        with open(image_filename, "wb") as fh:
+        content_type = resp.headers.get("Content-Type", "")
+        if not content_type.startswith("image/"):
+            raise ValueError(f"Unexpected content type for image: {content_type!r}")
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as fh:
             fh.write(resp.content)
+        os.replace(tmp_path, cache_path)
+        shutil.copyfile(cache_path, image_filename)
     except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        # Prefer an expired cached image over a blank frame
+        try:
+            shutil.copyfile(cache_path, image_filename)
+            return
+        except OSError:
+            pass
         # If download fails, create a simple black image
-        from PIL import Image
+        if (width, height) == _FALLBACK_SIZE:
+            with open(image_filename, "wb") as fh:
+                fh.write(_FALLBACK_BYTES)
+        else:
+            img = Image.new("RGB", (width, height), color=(0, 0, 0))
+            img.save(image_filename)
 
-        img = Image.new("RGB", (width, height), color=(0, 0, 0))
-        img.save(image_filename)
 
+# Encoder-specific ffmpeg options, in order of preference.  Hardware
+# encoders are tried first; libx264 is the portable fallback.
+_H264_ENCODER_OPTIONS: Dict[str, List[str]] = {
+    "h264_nvenc": ["-preset", "p1", "-tune", "ll", "-pix_fmt", "yuv420p"],
+    "h264_videotoolbox": ["-realtime", "1", "-pix_fmt", "yuv420p"],
+    "h264_qsv": ["-preset", "veryfast", "-pix_fmt", "nv12"],
+    "libx264": ["-tune", "stillimage", "-threads", "0", "-pix_fmt", "yuv420p"],
+}
 
-def combine_audio_image(image_filename: str, audio_filename: str, output_filename: str) -> None:
-    """Combine a still image and an audio file into a video using ffmpeg.
+# The H.264 encoder selected by ``_detect_h264_encoder``; probed once.
+_H264_ENCODER: Optional[str] = None
 
-    The video will have the same duration as the audio.  This function
-    assumes `ffmpeg` is available in the system `PATH`.  If ffmpeg is
-    missing or the command fails, a `RuntimeError` is raised.
 
-    Parameters
-    ----------
-    image_filename : str
-        Path to the background image.
-    audio_filename : str
-        Path to the MP3 audio file.
-    output_filename : str
-        Destination filename for the video.
+def _detect_h264_encoder() -> str:
+    """Return the preferred H.264 encoder supported by the local ffmpeg.
+
+    The result of ``ffmpeg -encoders`` is probed on first use and cached
+    in ``_H264_ENCODER``.  If ffmpeg cannot be queried, ``libx264`` is
+    assumed and any real problem surfaces when the video is encoded.
     """
-    # Construct an ffmpeg command that loops the image for the
-    # duration of the audio and uses sensible defaults for encoding.
-    command = [
+    global _H264_ENCODER
+    if _H264_ENCODER is None:
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=True,
+            )
+            available = set(result.stdout.decode("utf-8", errors="ignore").split())
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            available = set()
+        _H264_ENCODER = next((enc for enc in _H264_ENCODER_OPTIONS if enc in available), "libx264")
+    return _H264_ENCODER
+
+
+def _ffmpeg_command(image_filename: str, audio_filename: str, output_filename: str, encoder: str) -> List[str]:
+    """Build the ffmpeg command line for ``combine_audio_image``."""
+    # For a still image a 1 fps stream looks identical to 25 fps but
+    # needs far fewer encoded frames.
+    return [
         "ffmpeg",
         "-y",  # overwrite output file without asking
         "-loop", "1",
+        "-framerate", "1",
         "-i", image_filename,
         "-i", audio_filename,
-        "-c:v", "libx264",
-        "-tune", "stillimage",
+        "-c:v", encoder,
+        *_H264_ENCODER_OPTIONS[encoder],
+        "-r", "1",
         "-c:a", "aac",
         "-b:a", "192k",
-        "-pix_fmt", "yuv420p",
         "-shortest",
         output_filename,
     ]
+
+
+def _combine_with_pyav(image_filename: str, audio_filename: str, output_filename: str) -> None:
+    """Mux a still image and an audio file in-process using PyAV.
+
+    This avoids spawning an ffmpeg process per video.  The image is
+    encoded as a 1 fps H.264 stream lasting as long as the audio, and
+    the audio is re-encoded to AAC as in the ffmpeg CLI path.
+    """
+    with Image.open(image_filename) as img:
+        rgb = img.convert("RGB")
+    with av.open(audio_filename) as audio_in:
+        if not audio_in.streams.audio:
+            raise RuntimeError(f"PyAV failed: no audio stream in {audio_filename}")
+        in_audio = audio_in.streams.audio[0]
+        if in_audio.duration is not None:
+            seconds = float(in_audio.duration * in_audio.time_base)
+        else:
+            seconds = (audio_in.duration or 0) / av.time_base
+        with av.open(output_filename, mode="w") as out:
+            # Add both streams before muxing, which writes the header.
+            video = out.add_stream("libx264", rate=1)
+            video.width, video.height = rgb.size
+            video.pix_fmt = "yuv420p"
+            video.options = {"tune": "stillimage"}
+            video.codec_context.time_base = Fraction(1, 1000)
+            video.time_base = Fraction(1, 1000)
+            audio = out.add_stream("aac", rate=in_audio.rate)
+            audio.bit_rate = 192000
+
+            _mux_still_video(out, video, rgb, seconds)
+            for audio_frame in audio_in.decode(in_audio):
+                audio_frame.pts = None
+                out.mux(audio.encode(audio_frame))
+            out.mux(audio.encode(None))
+
+
+def _mux_still_video(out: Any, video: Any, rgb: Image.Image, seconds: float) -> None:
+    """Encode `rgb` on `video` as a 1 fps stream ending exactly at `seconds`.
+
+    `video` must use a millisecond time base so the last frame can be
+    cut short where the audio ends, matching ffmpeg's ``-shortest``.
+    """
+    end_pts = max(1, round(seconds * 1000))
+
+    def mux(packets: Any) -> None:
+        for packet in packets:
+            packet.duration = min(1000, end_pts - packet.pts)
+            out.mux(packet)
+
+    frame = av.VideoFrame.from_image(rgb)
+    for pts in range(0, end_pts, 1000):
+        frame.pts = pts
+        frame.time_base = video.codec_context.time_base
+        mux(video.encode(frame))
+    mux(video.encode(None))
+
+
+def _combine_with_ffmpeg(
+    image_filename: str, audio_filename: str, output_filename: str, timeout: Optional[float] = None
+) -> None:
+    """Combine a still image and an audio file by running the ffmpeg CLI.
+
+    `timeout` bounds the total time spent in ffmpeg, including a retry
+    with libx264 if the hardware encoder turns out to be unusable.
+    """
+    global _H264_ENCODER
+    deadline = None if timeout is None else time.monotonic() + timeout
+    # Loop the image for the duration of the audio, preferring a
+    # hardware encoder when one is available.
+    preferred = _detect_h264_encoder()
+    encoders = (preferred,) if preferred == "libx264" else (preferred, "libx264")
+    for encoder in encoders:
+        if encoder != preferred:
+            # The preferred encoder is compiled in but the device is
+            # unusable (e.g. no GPU present); use libx264 from now on.
+            _H264_ENCODER = encoder
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            raise RuntimeError("ffmpeg did not finish within the autopilot time budget.")
+        command = _ffmpeg_command(image_filename, audio_filename, output_filename, encoder)
+        try:
+            subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, timeout=remaining)
+            return
+        except FileNotFoundError:
+            raise RuntimeError("ffmpeg executable not found. Please install ffmpeg and ensure it is in your PATH.")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError("ffmpeg did not finish within the autopilot time budget.")
+        except subprocess.CalledProcessError as exc:
+            if encoder == "libx264":
+                raise RuntimeError(f"ffmpeg failed: {exc.stderr.decode('utf-8', errors='ignore')}")
+
+
+def combine_audio_image(
+    image_filename: str, audio_filename: str, output_filename: str, timeout: Optional[float] = None
+) -> None:
+    """Combine a still image and an audio file into a video.
+
+    The video will have the same duration as the audio.  If PyAV is
+    installed the video is muxed in-process; otherwise this function
+    assumes `ffmpeg` is available in the system `PATH`.  If encoding
+    fails, a `RuntimeError` is raised.
+
+    Parameters
+    ----------
+    image_filename : str
+        Path to the background image.
+    audio_filename : str
+        Path to the MP3 or WAV audio file.
+    output_filename : str
+        Destination filename for the video.
+    timeout : float, optional
+        Maximum number of seconds the ffmpeg CLI may run.  The in-process
+        PyAV path is not interruptible and ignores this value.
+    """
+    if av is None:
+        _combine_with_ffmpeg(image_filename, audio_filename, output_filename, timeout)
+        return
     try:
-        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-    except FileNotFoundError:
-        raise RuntimeError("ffmpeg executable not found. Please install ffmpeg and ensure it is in your PATH.")
-    except subprocess.CalledProcessError as exc:
-        raise RuntimeError(f"ffmpeg failed: {exc.stderr.decode('utf-8', errors='ignore')}")
+        _combine_with_pyav(image_filename, audio_filename, output_filename)
+    except (av.error.FFmpegError, OSError) as exc:
+        # OSError also covers PIL.UnidentifiedImageError for a bad image.
+        raise RuntimeError(f"PyAV failed: {exc}")
+
+
+def _remaining(deadline: float) -> float:
+    """Return the seconds left before `deadline`, raising once it has passed."""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise RuntimeError(f"Autopilot exceeded its {AUTOPILOT_TIMEOUT} second time budget.")
+    return remaining
 
 
 def run_autopilot(topics_override: Optional[List[str]] = None) -> str:
@@ -189,37 +513,53 @@ def run_autopilot(topics_override: Optional[List[str]] = None) -> str:
     This function fetches trending topics (or uses the provided
     override), generates a narration script, creates a voice‑over,
     downloads a background image, and merges them into a video.  The
-    output files are named with a timestamp to avoid collisions.
+    output files are named with a timestamp to avoid collisions.  The
+    whole run must finish within ``AUTOPILOT_TIMEOUT`` seconds, otherwise
+    a `RuntimeError` is raised.
 
     Parameters
     ----------
     topics_override : list of str, optional
         If provided, these strings are used as the topics instead of
-        pulling live data from Reddit.  Each item becomes a "Story" in
-        the generated video.
+        pulling live data from Reddit (or Pushshift, see
+        ``TOPIC_SOURCE``).  Each item becomes a "Story" in the generated
+        video.
 
     Returns
     -------
     str
         The path to the generated video file.
     """
+    deadline = time.monotonic() + AUTOPILOT_TIMEOUT
     # Determine topics either from the override list or by querying Reddit
     if topics_override and len(topics_override) > 0:
         topics = [{"title": t, "url": ""} for t in topics_override]
     else:
-        topics = get_trending_topics(num_topics=5)
+        fetch = get_trending_topics_pushshift if TOPIC_SOURCE == "pushshift" else get_trending_topics
+        topics = fetch(num_topics=5)
     # Generate the narration script
     script_text = generate_script(topics)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     audio_filename = f"voice_{timestamp}.mp3"
     image_filename = f"background_{timestamp}.jpg"
     video_filename = f"output_{timestamp}.mp4"
-    # Create audio
-    generate_audio(script_text, audio_filename)
-    # Download image
-    download_image(query="ai,technology", width=1280, height=720, image_filename=image_filename)
+    # Create audio and download the image concurrently; both are
+    # network-bound and write to distinct files.
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        audio_job = executor.submit(generate_audio, script_text, audio_filename)
+        image_job = executor.submit(
+            download_image, query="ai,technology", width=1280, height=720, image_filename=image_filename
+        )
+        audio_filename = audio_job.result(timeout=_remaining(deadline))
+        image_job.result(timeout=_remaining(deadline))
+    except FutureTimeoutError:
+        raise RuntimeError(f"Autopilot exceeded its {AUTOPILOT_TIMEOUT} second time budget.")
+    finally:
+        # Do not block on a stalled worker once the budget is exhausted.
+        executor.shutdown(wait=False)
     # Combine into video
-    combine_audio_image(image_filename, audio_filename, video_filename)
+    combine_audio_image(image_filename, audio_filename, video_filename, timeout=_remaining(deadline))
     return os.path.abspath(video_filename)
 
 
@@ -0,0 +1,9 @@
+"""WSGI entry point for running the admin dashboard under a production server.
+
+Example using Gunicorn:
+
+    gunicorn -w 1 --threads 4 --timeout 180 wsgi:application
+
+"""
+
+from app import app as application